@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the token manager's per-request hot path.
+
+Times the calls an API client makes on every request against a cached,
+valid token. No network access is needed. Run with:
+
+    python bench_token_manager.py
+"""
+
+import time
+import timeit
+
+from token_manager import TokenManager
+
+
+ITERATIONS = 100000
+
+
+def main():
+    """Run the benchmarks and print the time per call."""
+    manager = TokenManager._create()
+    manager.configure("bench-client-id", "bench-client-secret", "bench-workspace-id")
+    # Simulate a freshly minted one-hour token
+    manager._state = manager._new_state("bench-token", "Bearer", time.time() + 3600)
+
+    for name, func in [
+        ("_is_token_valid", manager._is_token_valid),
+        ("get_token", manager.get_token),
+        ("get_auth_header", manager.get_auth_header),
+    ]:
+        elapsed = timeit.timeit(func, number=ITERATIONS)
+        print(f"{name}: {elapsed / ITERATIONS * 1e9:.0f} ns per call")
+
+
+if __name__ == "__main__":
+    main()
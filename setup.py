@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Build script for airbyte-token-manager.
+
+When mypyc is installed, token_manager.py is compiled to a C extension so
+the per-request methods (get_token, get_auth_header) run as native code.
+Without mypyc the module is installed as plain Python and behaves the same.
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["token_manager.py"])
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="airbyte-token-manager",
+    version="0.1.0",
+    description="Singleton manager for fetching and refreshing Airbyte API access tokens",
+    py_modules=["token_manager"],
+    ext_modules=ext_modules,
+    # Retry(allowed_methods=...) needs urllib3 1.26 or newer
+    install_requires=["requests", "urllib3>=1.26"],
+    extras_require={"fast": ["orjson"]},
+)
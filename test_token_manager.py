@@ -1,189 +1,396 @@
 #!/usr/bin/env python3
 """
-Test script for the refactored token manager functionality.
-This script tests the token manager independently and then tests the integration with main.py.
+Tests for the token manager.
+
+The Airbyte token endpoints are mocked with the `responses` library, so the
+suite runs offline and the tests are independent of each other. Run with:
+
+    pytest test_token_manager.py
+
+or in parallel (requires pytest-xdist):
+
+    pytest -n auto test_token_manager.py
 """
 
+import json
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from responses import matchers
+
+import token_manager
 from token_manager import get_token_manager, TokenManager
 
 
-def test_token_manager_standalone():
-    """Test the token manager as a standalone component."""
-    print("=" * 60)
-    print("TESTING TOKEN MANAGER STANDALONE")
-    print("=" * 60)
-    
-    # Load environment variables
-    load_dotenv()
-    
-    # Get credentials
-    client_id = os.getenv('AIRBYTE_CLIENT_ID')
-    client_secret = os.getenv('AIRBYTE_CLIENT_SECRET')
-    workspace_id = os.getenv('AIRBYTE_WORKSPACE_ID')
-    
-    if not all([client_id, client_secret, workspace_id]):
-        print("❌ Missing required environment variables")
-        return False
-    
-    try:
-        # Test singleton behavior
-        print("1. Testing singleton behavior...")
-        manager1 = get_token_manager()
-        manager2 = get_token_manager()
-        manager3 = TokenManager()
-        
-        if manager1 is manager2 is manager3:
-            print("✅ Singleton pattern working correctly")
-        else:
-            print("❌ Singleton pattern failed")
-            return False
-        
-        # Test configuration
-        print("2. Testing configuration...")
-        manager1.configure(client_id, client_secret, workspace_id)
-        
-        if manager1.is_configured():
-            print("✅ Token manager configured successfully")
-        else:
-            print("❌ Token manager configuration failed")
-            return False
-        
-        # Test token info before getting token
-        print("3. Testing token info (before token creation)...")
-        info = manager1.get_token_info()
-        print(f"   Has token: {info['has_token']}")
-        print(f"   Is configured: {info['is_configured']}")
-        print(f"   Is valid: {info['is_valid']}")
-        
-        # Test token creation
-        print("4. Testing token creation...")
-        token = manager1.get_token()
-        
-        if token:
-            print(f"✅ Token created successfully: {token[:20]}...")
-        else:
-            print("❌ Token creation failed")
-            return False
-        
-        # Test auth header
-        print("5. Testing auth header...")
-        auth_header = manager1.get_auth_header()
-        
-        if 'Authorization' in auth_header and auth_header['Authorization'].startswith('Bearer '):
-            print("✅ Auth header created successfully")
-        else:
-            print("❌ Auth header creation failed")
-            return False
-        
-        # Test token info after getting token
-        print("6. Testing token info (after token creation)...")
-        info = manager1.get_token_info()
-        print(f"   Has token: {info['has_token']}")
-        print(f"   Token type: {info['token_type']}")
-        print(f"   Expires at: {info['expires_at']}")
-        print(f"   Is valid: {info['is_valid']}")
-        
-        # Test token reuse (should not create new token)
-        print("7. Testing token reuse...")
-        token2 = manager1.get_token()
-        
-        if token == token2:
-            print("✅ Token reuse working correctly")
-        else:
-            print("❌ Token reuse failed - new token created unnecessarily")
-            return False
-        
-        # Test token invalidation
-        print("8. Testing token invalidation...")
-        manager1.invalidate_token()
-        info = manager1.get_token_info()
-        
-        if not info['has_token']:
-            print("✅ Token invalidation working correctly")
-        else:
-            print("❌ Token invalidation failed")
-            return False
-        
-        print("✅ All token manager tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Token manager test failed with error: {e}")
-        return False
-
-
-def test_main_integration():
-    """Test the integration with main.py."""
-    print("\n" + "=" * 60)
-    print("TESTING MAIN.PY INTEGRATION")
-    print("=" * 60)
-    
-    try:
-        # Import and test the StripeAnalyzer initialization
-        from main import StripeAnalyzer
-        
-        print("1. Testing StripeAnalyzer initialization...")
-        analyzer = StripeAnalyzer()
-        
-        if hasattr(analyzer, 'token_manager') and analyzer.token_manager.is_configured():
-            print("✅ StripeAnalyzer initialized with configured token manager")
-        else:
-            print("❌ StripeAnalyzer initialization failed")
-            return False
-        
-        print("2. Testing token manager access from analyzer...")
-        token_info = analyzer.token_manager.get_token_info()
-        
-        if token_info['is_configured']:
-            print("✅ Token manager accessible from StripeAnalyzer")
-        else:
-            print("❌ Token manager not properly accessible")
-            return False
-        
-        print("3. Testing auth header generation...")
-        auth_header = analyzer.token_manager.get_auth_header()
-        
-        if 'Authorization' in auth_header:
-            print("✅ Auth header generation working from StripeAnalyzer")
-        else:
-            print("❌ Auth header generation failed")
-            return False
-        
-        print("✅ All integration tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Integration test failed with error: {e}")
-        return False
-
-
-def main():
-    """Run all tests."""
-    print("TESTING REFACTORED TOKEN MANAGEMENT")
-    print("=" * 60)
-    
-    # Test standalone functionality
-    standalone_success = test_token_manager_standalone()
-    
-    # Test integration
-    integration_success = test_main_integration()
-    
-    # Summary
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    
-    if standalone_success and integration_success:
-        print("🎉 ALL TESTS PASSED! Refactoring successful.")
-        print("\nThe token management has been successfully extracted from main.py")
-        print("into a standalone, reusable token_manager.py module.")
-        return 0
-    else:
-        print("❌ SOME TESTS FAILED! Please check the implementation.")
-        return 1
-
-
-if __name__ == "__main__":
-    exit(main())
+ENDPOINTS = token_manager._ENDPOINTS
+
+CLIENT_ID = "test-client-id"
+CLIENT_SECRET = "test-client-secret"
+WORKSPACE_ID = "test-workspace-id"
+
+
+class _WaitingExecutor(ThreadPoolExecutor):
+    """Executor that always waits for its workers on shutdown."""
+
+    def shutdown(self, wait=True, **kwargs):
+        super().shutdown(wait=True, **kwargs)
+
+
+@pytest.fixture
+def mocked_responses(monkeypatch):
+    """Intercept all HTTP requests made through requests."""
+    # The endpoint probe normally leaves slower requests running after it
+    # returns; wait for them so call counts are deterministic and nothing
+    # reaches the network after the mock is torn down
+    monkeypatch.setattr(token_manager, "ThreadPoolExecutor", _WaitingExecutor)
+    # Parallel endpoint probing means not every registered URL gets called
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
+@pytest.fixture
+def token_endpoints(mocked_responses):
+    """Mock the first endpoint to issue tokens and the others to fail."""
+    mocked_responses.add(
+        responses.POST,
+        ENDPOINTS[0],
+        json={"access_token": "test-token", "token_type": "Bearer", "expires_in": 3600},
+        status=200
+    )
+    for url in ENDPOINTS[1:]:
+        mocked_responses.add(responses.POST, url, status=404)
+    return mocked_responses
+
+
+@pytest.fixture
+def slow_token_endpoint(mocked_responses):
+    """Mock a token endpoint that blocks until the test releases it."""
+    entered = threading.Event()
+    release = threading.Event()
+
+    def callback(request):
+        entered.set()
+        release.wait(timeout=10)
+        body = {"access_token": "slow-token", "expires_in": 3600}
+        return 200, {}, json.dumps(body)
+
+    mocked_responses.add_callback(responses.POST, ENDPOINTS[0], callback=callback)
+    for url in ENDPOINTS[1:]:
+        mocked_responses.add(responses.POST, url, status=404)
+
+    yield entered, release
+    release.set()
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    """Provide a fresh, unconfigured TokenManager installed as the singleton."""
+    fresh = TokenManager._create()
+    monkeypatch.setattr(TokenManager, "_instance", fresh)
+    monkeypatch.setattr(TokenManager, "_instances", {})
+    monkeypatch.setattr(token_manager, "_SINGLETON", fresh)
+    monkeypatch.setattr(token_manager, "_CACHE_DIR", str(tmp_path))
+    return fresh
+
+
+@pytest.fixture
+def configured_manager(manager):
+    """Provide a fresh TokenManager configured with test credentials."""
+    manager.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID)
+    return manager
+
+
+def test_singleton(manager):
+    """1. get_token_manager() and TokenManager() return the same instance."""
+    assert get_token_manager() is get_token_manager() is TokenManager() is manager
+
+
+@pytest.mark.parametrize("arg", [False, 0, None, object()])
+def test_constructor_argument_cannot_bypass_singleton(manager, arg):
+    assert TokenManager(arg) is manager
+
+
+def test_configure(manager):
+    """2. configure() marks the manager as configured."""
+    assert not manager.is_configured()
+    manager.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID)
+    assert manager.is_configured()
+
+
+def test_configure_requires_all_credentials(manager):
+    with pytest.raises(ValueError):
+        manager.configure(CLIENT_ID, "", WORKSPACE_ID)
+
+
+def test_get_token_requires_configuration(manager):
+    with pytest.raises(ValueError):
+        manager.get_token()
+
+
+def test_token_info_before_token(configured_manager):
+    """3. Token info reports no token before one is created."""
+    info = configured_manager.get_token_info()
+    assert info["is_configured"]
+    assert not info["has_token"]
+    assert not info["is_valid"]
+    assert info["expires_at"] is None
+
+
+def test_token_creation(configured_manager, token_endpoints):
+    """4. get_token() creates a token."""
+    assert configured_manager.get_token() == "test-token"
+
+
+def test_auth_header(configured_manager, token_endpoints):
+    """5. get_auth_header() returns a Bearer Authorization header."""
+    assert configured_manager.get_auth_header() == {"Authorization": "Bearer test-token"}
+
+
+def test_auth_header_is_a_copy(configured_manager, token_endpoints):
+    header = configured_manager.get_auth_header()
+    header["X-Extra"] = "1"
+    assert configured_manager.get_auth_header() == {"Authorization": "Bearer test-token"}
+
+
+def test_token_info_after_token(configured_manager, token_endpoints):
+    """6. Token info reports a valid token after one is created."""
+    configured_manager.get_token()
+    info = configured_manager.get_token_info()
+    assert info["has_token"]
+    assert info["token_type"] == "Bearer"
+    assert info["expires_at"] is not None
+    assert info["is_valid"]
+
+
+def test_token_reuse(configured_manager, token_endpoints):
+    """7. A valid token is reused without another request."""
+    token = configured_manager.get_token()
+    calls = len(token_endpoints.calls)
+    assert configured_manager.get_token() == token
+    assert len(token_endpoints.calls) == calls
+
+
+def test_token_invalidation(configured_manager, token_endpoints):
+    """8. invalidate_token() drops the cached token."""
+    configured_manager.get_token()
+    configured_manager.invalidate_token()
+    info = configured_manager.get_token_info()
+    assert not info["has_token"]
+    assert not info["is_valid"]
+
+
+def test_refresh_uses_pinned_endpoint(configured_manager, token_endpoints):
+    configured_manager.get_token()
+    assert configured_manager._token_url == ENDPOINTS[0]
+
+    configured_manager.invalidate_token()
+    calls = len(token_endpoints.calls)
+    configured_manager.get_token()
+    assert len(token_endpoints.calls) == calls + 1
+    assert token_endpoints.calls[-1].request.url == ENDPOINTS[0]
+
+
+def test_expired_token_is_refreshed(configured_manager, token_endpoints):
+    configured_manager.get_token()
+    configured_manager._state = configured_manager._state._replace(deadline=0.0)
+    calls = len(token_endpoints.calls)
+    configured_manager.get_token()
+    assert len(token_endpoints.calls) == calls + 1
+
+
+def test_concurrent_refresh_mints_once(configured_manager, token_endpoints):
+    configured_manager.get_token()
+    configured_manager._state = configured_manager._state._replace(deadline=0.0)
+    calls = len(token_endpoints.calls)
+
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def fetch():
+        barrier.wait(timeout=5)
+        return configured_manager.get_token()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        tokens = list(pool.map(lambda _: fetch(), range(threads)))
+
+    assert tokens == ["test-token"] * threads
+    assert len(token_endpoints.calls) == calls + 1
+
+
+def test_form_encoded_fallback(configured_manager, mocked_responses):
+    mocked_responses.add(
+        responses.POST,
+        ENDPOINTS[0],
+        status=400,
+        match=[matchers.header_matcher({"content-type": "application/json"})]
+    )
+    mocked_responses.add(
+        responses.POST,
+        ENDPOINTS[0],
+        json={"access_token": "form-token", "expires_in": 3600},
+        status=200,
+        match=[matchers.header_matcher({"content-type": "application/x-www-form-urlencoded"})]
+    )
+    for url in ENDPOINTS[1:]:
+        mocked_responses.add(responses.POST, url, status=404)
+
+    assert configured_manager.get_token() == "form-token"
+
+
+@pytest.mark.parametrize("body", [["x"], "x", 42])
+def test_non_object_body_does_not_stop_probe(configured_manager, mocked_responses, body):
+    mocked_responses.add(responses.POST, ENDPOINTS[0], json=body, status=200)
+    mocked_responses.add(responses.POST, ENDPOINTS[1], status=404)
+    mocked_responses.add(
+        responses.POST,
+        ENDPOINTS[2],
+        json={"access_token": "good-token", "expires_in": 3600},
+        status=200
+    )
+
+    assert configured_manager.get_token() == "good-token"
+
+
+def test_non_first_endpoint_is_pinned(configured_manager, mocked_responses):
+    mocked_responses.add(responses.POST, ENDPOINTS[0], status=404)
+    mocked_responses.add(
+        responses.POST,
+        ENDPOINTS[1],
+        json={"access_token": "second-token", "expires_in": 3600},
+        status=200
+    )
+    mocked_responses.add(responses.POST, ENDPOINTS[2], status=404)
+
+    assert configured_manager.get_token() == "second-token"
+    assert configured_manager._token_url == ENDPOINTS[1]
+
+    configured_manager.invalidate_token()
+    calls = len(mocked_responses.calls)
+    configured_manager.get_token()
+    assert len(mocked_responses.calls) == calls + 1
+    assert mocked_responses.calls[-1].request.url == ENDPOINTS[1]
+
+
+def test_all_endpoints_fail(configured_manager, mocked_responses):
+    for url in ENDPOINTS:
+        mocked_responses.add(responses.POST, url, status=401)
+
+    with pytest.raises(Exception, match="Failed to create access token"):
+        configured_manager.get_token()
+
+
+def test_reconfigure_with_same_credentials_keeps_token(configured_manager, token_endpoints):
+    configured_manager.get_token()
+    configured_manager.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID)
+    assert configured_manager.get_token_info()["has_token"]
+
+    configured_manager.configure(CLIENT_ID, "rotated-secret", WORKSPACE_ID)
+    assert not configured_manager.get_token_info()["has_token"]
+
+
+def test_noop_configure_does_not_wait_for_refresh(configured_manager, slow_token_endpoint):
+    entered, release = slow_token_endpoint
+    refresh = threading.Thread(target=configured_manager.get_token)
+    refresh.start()
+    assert entered.wait(timeout=5)
+
+    # The refresh holds the lock; an unchanged configure() must not wait for it
+    reconfigure = threading.Thread(
+        target=configured_manager.configure,
+        args=(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID)
+    )
+    reconfigure.start()
+    reconfigure.join(timeout=2)
+    assert not reconfigure.is_alive()
+    assert refresh.is_alive()
+
+    release.set()
+    refresh.join(timeout=5)
+    assert configured_manager.get_token() == "slow-token"
+
+
+def test_per_credential_managers(manager, token_endpoints):
+    tenant_a = get_token_manager("client-a", "secret-a", "workspace-a")
+    tenant_b = get_token_manager("client-b", "secret-b", "workspace-b")
+
+    assert tenant_a is not tenant_b
+    assert tenant_a is not manager
+    assert get_token_manager("client-a", "secret-a", "workspace-a") is tenant_a
+
+    tenant_a.get_token()
+    assert tenant_a.get_token_info()["has_token"]
+    assert not tenant_b.get_token_info()["has_token"]
+
+
+def test_per_credential_manager_follows_secret_rotation(manager):
+    tenant = get_token_manager("client-a", "good-secret", "workspace-a")
+    assert get_token_manager("client-a", "bad-secret", "workspace-a") is tenant
+    assert tenant._client_secret == "bad-secret"
+
+    assert get_token_manager("client-a", "good-secret", "workspace-a") is tenant
+    assert tenant._client_secret == "good-secret"
+
+
+def test_per_credential_manager_keeps_persistence(manager, token_endpoints):
+    tenant = get_token_manager("client-a", "secret-a", "workspace-a")
+    tenant.configure("client-a", "secret-a", "workspace-a", persist_token=True)
+    tenant.get_token()
+
+    assert get_token_manager("client-a", "secret-a", "workspace-a") is tenant
+    assert tenant._cache_path
+    assert tenant.get_token_info()["has_token"]
+
+
+def test_per_credential_managers_require_all_credentials(manager):
+    with pytest.raises(ValueError):
+        get_token_manager("client-a", None, "workspace-a")
+
+
+def test_persisted_token_is_reused(manager, token_endpoints, tmp_path):
+    manager.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID, persist_token=True)
+    token = manager.get_token()
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A second process with the same credentials loads the token from disk
+    other = TokenManager._create()
+    other.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID, persist_token=True)
+    calls = len(token_endpoints.calls)
+    assert other.get_token() == token
+    assert len(token_endpoints.calls) == calls
+
+    # The cache is keyed by the client secret
+    wrong_secret = TokenManager._create()
+    wrong_secret.configure(CLIENT_ID, "other-secret", WORKSPACE_ID, persist_token=True)
+    assert not wrong_secret.get_token_info()["has_token"]
+
+    manager.invalidate_token()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("mac", [12345, None, "not-ascii-\u00e9"])
+def test_corrupt_cache_mac_is_ignored(manager, tmp_path, mac):
+    manager.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID, persist_token=True)
+    with open(manager._cache_path, "w") as f:
+        json.dump({
+            "access_token": "cached-token",
+            "token_type": "Bearer",
+            "expires_at": time.time() + 3600,
+            "mac": mac
+        }, f)
+
+    other = TokenManager._create()
+    other.configure(CLIENT_ID, CLIENT_SECRET, WORKSPACE_ID, persist_token=True)
+    assert not other.get_token_info()["has_token"]
+
+
+def test_token_validity_check(manager):
+    # Simulate a freshly minted one-hour token without hitting the network
+    manager._state = manager._new_state("test-token", "Bearer", time.time() + 3600)
+    assert manager._is_token_valid()
+
+    manager._state = manager._state._replace(deadline=0.0)
+    assert not manager._is_token_valid()
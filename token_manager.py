@@ -5,11 +5,128 @@ This module provides a singleton token manager that handles access token creatio
 and management without relying on environment variables.
 """
 
-import requests
+import hashlib
+import hmac
 import json
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import logging
+import os
+import tempfile
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, Callable, ClassVar, NamedTuple
+from datetime import datetime
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_json_loads: Callable[[bytes], Any]
+try:
+    # Optional: faster JSON parsing for token responses
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Token endpoint variations, tried in parallel on first use
+_ENDPOINTS = (
+    "https://api.airbyte.com/api/public/v1/applications/token",
+    "https://api.airbyte.com/v1/applications/token",
+    "https://api.airbyte.ai/api/v1/applications/token"
+)
+
+_JSON_HEADERS = {
+    "accept": "application/json",
+    "content-type": "application/json"
+}
+
+_FORM_HEADERS = {
+    "accept": "application/json",
+    "content-type": "application/x-www-form-urlencoded"
+}
+
+# Where tokens are persisted when configure(..., persist_token=True) is used
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "airbyte-token-manager")
+
+
+def _create_session() -> requests.Session:
+    """
+    Create the HTTP session used for all token requests.
+    
+    Returns:
+        Session with pooled keep-alive connections and retries on 5xx
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        # Room for a parallel endpoint probe from several managers at once
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            # Only retry on 5xx responses. A connect or read failure means the
+            # endpoint is down, so fail fast and let the probe try the others
+            connect=0,
+            read=0,
+            status=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            # Token requests are POSTs, which urllib3 won't retry by default
+            allowed_methods=["POST"],
+            # Return the last response instead of raising so we can fall
+            # back to a form-encoded request
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every TokenManager so connections to the token endpoints (two of
+# which are on the same host) are reused across instances and refreshes
+# instead of paying a new TCP + TLS handshake each time
+_SESSION = _create_session()
+
+
+def _credentials_key(client_id: str, workspace_id: str) -> bytes:
+    """
+    Hash a client/workspace pair into a short key that is safe to store.
+    
+    Args:
+        client_id: Airbyte client ID
+        workspace_id: Airbyte workspace ID
+        
+    Returns:
+        16-byte blake2b digest
+    """
+    return hashlib.blake2b(f"{client_id}|{workspace_id}".encode(), digest_size=16).digest()
+
+
+class _TokenState(NamedTuple):
+    """
+    Immutable snapshot of everything known about the current token.
+    
+    TokenManager swaps whole snapshots with a single attribute store, so
+    readers never see a token paired with another token's expiry or header.
+    """
+    
+    # Empty string when there is no token
+    access_token: str
+    # Monotonic deadline with the refresh buffer already subtracted
+    deadline: float
+    token_type: str
+    auth_header: Dict[str, str]
+    # Wall-clock expiry, used for display and for the on-disk cache
+    expires_at: Optional[float]
+    expires_at_iso: Optional[str]
+
+
+_EMPTY_STATE = _TokenState("", 0.0, "Bearer", {}, None, None)
+
+# Passed to TokenManager.__new__ by _create() to get a non-singleton
+# instance; no value a caller could pass by accident is identical to it
+_PRIVATE = object()
 
 
 class TokenManager:
@@ -21,32 +138,116 @@ class TokenManager:
     explicitly during initialization.
     """
     
-    _instance = None
-    _lock = threading.Lock()
+    # No per-instance __dict__; attribute reads on the hot path go straight
+    # to the slot descriptors. Class-level attributes below are not slots.
+    __slots__ = (
+        "_lock",
+        "_client_id",
+        "_client_secret",
+        "_workspace_id",
+        "_cred_fingerprint",
+        "_configured",
+        "_state",
+        "_token_url",
+        "_cache_path"
+    )
+    
+    _instance: ClassVar[Optional["TokenManager"]] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    # Per-credential instances created by get_token_manager(), keyed by a
+    # hash of client_id and workspace_id so secrets never become dict keys
+    _instances: ClassVar[Dict[bytes, "TokenManager"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    # Refresh tokens this many seconds before they actually expire
+    _BUFFER_SECONDS: ClassVar[int] = 300
     
-    def __new__(cls):
+    def __new__(cls, _token: object = None) -> "TokenManager":
         """Ensure only one instance exists (singleton pattern)."""
+        if _token is _PRIVATE:
+            # Private escape hatch for _create(). The object is allocated
+            # here because mypyc-compiled classes only allow super().__new__
+            # inside __new__ itself.
+            instance = super().__new__(cls)
+            instance._setup()
+            return instance
+        
         if cls._instance is None:
-            with cls._lock:
+            with cls._instance_lock:
                 if cls._instance is None:
-                    cls._instance = super(TokenManager, cls).__new__(cls)
-                    cls._instance._initialized = False
+                    cls._instance = cls._create()
         return cls._instance
     
-    def __init__(self):
-        """Initialize the token manager (only runs once due to singleton)."""
-        if self._initialized:
-            return
+    @classmethod
+    def _create(cls) -> "TokenManager":
+        """
+        Create a new, unconfigured instance, bypassing the singleton check.
+        
+        Returns:
+            New TokenManager instance
+        """
+        return cls.__new__(cls, _PRIVATE)
+    
+    @classmethod
+    def _for_credentials(cls, client_id: str, client_secret: str, workspace_id: str) -> "TokenManager":
+        """
+        Get the configured instance for a set of credentials, creating it if needed.
+        
+        Args:
+            client_id: Airbyte client ID
+            client_secret: Airbyte client secret
+            workspace_id: Airbyte workspace ID
             
-        self._client_id: Optional[str] = None
-        self._client_secret: Optional[str] = None
-        self._workspace_id: Optional[str] = None
-        self._access_token: Optional[str] = None
-        self._token_expires_at: Optional[datetime] = None
-        self._token_type: str = "Bearer"
-        self._initialized = True
+        Returns:
+            TokenManager dedicated to these credentials
+        """
+        key = _credentials_key(client_id, workspace_id)
+        
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._instances_lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = cls._create()
+                    cls._instances[key] = instance
+        
+        # No-op unless this is a new instance or the secret was rotated.
+        # Keep whatever persistence setting the instance was configured with.
+        instance.configure(client_id, client_secret, workspace_id, persist_token=bool(instance._cache_path))
+        return instance
+    
+    def _setup(self) -> None:
+        """
+        Initialize instance state.
+        
+        Called once from __new__ rather than from __init__, so repeated
+        TokenManager() calls don't re-run any initialization logic.
+        """
+        # Each instance has its own lock so tenants don't block each other.
+        # It serializes refreshes and reconfiguration; readers never take it.
+        self._lock = threading.Lock()
+        self._client_id: str = ""
+        self._client_secret: str = ""
+        self._workspace_id: str = ""
+        # Hash of the configured credentials, used to skip no-op reconfiguration
+        self._cred_fingerprint: bytes = b""
+        # Set once by configure(), which is the only place credentials change
+        self._configured: bool = False
+        # Replaced as a whole, never mutated
+        self._state: _TokenState = _EMPTY_STATE
+        # Endpoint that last issued a token; refreshes go straight to it
+        self._token_url: Optional[str] = None
+        # Token cache file, empty unless persistence is enabled
+        self._cache_path: str = ""
     
-    def configure(self, client_id: str, client_secret: str, workspace_id: str) -> None:
+    def configure(
+        self,
+        client_id: str,
+        client_secret: str,
+        workspace_id: str,
+        persist_token: bool = False
+    ) -> None:
         """
         Configure the token manager with credentials.
         
@@ -54,6 +255,8 @@ class TokenManager:
             client_id: Airbyte client ID
             client_secret: Airbyte client secret
             workspace_id: Airbyte workspace ID
+            persist_token: Cache the token on disk so other processes using
+                the same credentials can reuse it until it expires
             
         Raises:
             ValueError: If any required parameter is missing or empty
@@ -61,13 +264,52 @@ class TokenManager:
         if not all([client_id, client_secret, workspace_id]):
             raise ValueError("All parameters (client_id, client_secret, workspace_id) are required")
         
+        fingerprint = hashlib.blake2b(
+            f"{client_id}|{client_secret}|{workspace_id}".encode(), digest_size=16
+        ).digest()
+        
+        # Same credentials and cache setting: keep the current token rather
+        # than forcing a refresh. Checked before taking the lock, which is
+        # held for the duration of a token refresh. Constant-time compare
+        # because the fingerprint covers the secret.
+        if self._is_current_config(fingerprint, persist_token):
+            return
+        
         with self._lock:
+            # Re-check: another thread may have configured while we waited
+            if self._is_current_config(fingerprint, persist_token):
+                return
+            
+            self._cred_fingerprint = fingerprint
             self._client_id = client_id
             self._client_secret = client_secret
             self._workspace_id = workspace_id
-            # Clear existing token when reconfiguring
-            self._access_token = None
-            self._token_expires_at = None
+            self._configured = True
+            
+            # Replace the existing token when credentials change
+            if persist_token:
+                key = _credentials_key(client_id, workspace_id)
+                self._cache_path = os.path.join(_CACHE_DIR, f"{key.hex()}.json")
+                self._state = self._load_cached_token() or _EMPTY_STATE
+            else:
+                self._cache_path = ""
+                self._state = _EMPTY_STATE
+    
+    def _is_current_config(self, fingerprint: bytes, persist_token: bool) -> bool:
+        """
+        Check whether configure() arguments match the current configuration.
+        
+        Args:
+            fingerprint: Hash of the client ID, secret and workspace ID
+            persist_token: Requested on-disk cache setting
+            
+        Returns:
+            True if nothing would change, False otherwise
+        """
+        return (
+            hmac.compare_digest(fingerprint, self._cred_fingerprint)
+            and persist_token == bool(self._cache_path)
+        )
     
     def is_configured(self) -> bool:
         """
@@ -76,7 +318,7 @@ class TokenManager:
         Returns:
             True if configured, False otherwise
         """
-        return all([self._client_id, self._client_secret, self._workspace_id])
+        return self._configured
     
     def _is_token_valid(self) -> bool:
         """
@@ -85,40 +327,221 @@ class TokenManager:
         Returns:
             True if token is valid, False otherwise
         """
-        if not self._access_token:
-            return False
+        state = self._state
+        return bool(state.access_token) and time.monotonic() < state.deadline
+    
+    def _new_state(self, access_token: str, token_type: str, expires_at: Optional[float]) -> _TokenState:
+        """
+        Build the token state for a newly obtained token.
+        
+        Args:
+            access_token: Access token string
+            token_type: Token type used in the Authorization header
+            expires_at: Wall-clock expiry as a Unix timestamp, or None if the
+                server did not provide expiry info (token is then treated as
+                valid until invalidated)
+            
+        Returns:
+            New token state
+        """
+        auth_header = {"Authorization": f"{token_type} {access_token}"}
+        
+        if expires_at is None:
+            return _TokenState(access_token, float("inf"), token_type, auth_header, None, None)
+        
+        # Monotonic clocks aren't comparable with wall-clock time, so convert
+        # via the remaining lifetime
+        deadline = time.monotonic() + (expires_at - time.time()) - self._BUFFER_SECONDS
+        expires_at_iso = datetime.fromtimestamp(expires_at).isoformat()
+        return _TokenState(access_token, deadline, token_type, auth_header, expires_at, expires_at_iso)
+    
+    def _cache_mac(self, access_token: str, token_type: str, expires_at: float) -> str:
+        """
+        Compute the integrity tag for a cached token.
+        
+        Keyed with the client secret, so a cache file written for other
+        credentials (or edited by hand) is rejected.
+        
+        Returns:
+            Hex-encoded blake2b MAC
+        """
+        # blake2b keys are limited to 64 bytes, so derive one from the secret
+        key = hashlib.blake2b(self._client_secret.encode(), digest_size=32).digest()
+        mac = hashlib.blake2b(key=key, digest_size=16)
+        mac.update(f"{access_token}|{token_type}|{expires_at!r}".encode())
+        return mac.hexdigest()
+    
+    def _load_cached_token(self) -> Optional[_TokenState]:
+        """
+        Read the token from the on-disk cache if it is still valid.
+        
+        Returns:
+            Token state from the cache, or None if the cache file is
+            missing, unreadable, tampered with or expired
+        """
+        try:
+            with open(self._cache_path, "rb") as f:
+                data = _json_loads(f.read())
+            access_token = data["access_token"]
+            token_type = data["token_type"]
+            expires_at = float(data["expires_at"])
+            # compare_digest raises TypeError for a non-string or non-ASCII
+            # MAC, so check it inside the guarded block
+            mac_valid = hmac.compare_digest(data["mac"], self._cache_mac(access_token, token_type, expires_at))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("No usable cached token at %s: %s", self._cache_path, e)
+            return None
+        
+        if not mac_valid:
+            logger.debug("Ignoring cached token with invalid MAC at %s", self._cache_path)
+            return None
+        
+        # The file stores wall-clock expiry because monotonic clocks reset on
+        # reboot; _new_state() translates it back to a monotonic deadline
+        if expires_at - time.time() <= self._BUFFER_SECONDS:
+            logger.debug("Cached token at %s has expired", self._cache_path)
+            return None
+        
+        logger.debug("Loaded cached token from %s", self._cache_path)
+        return self._new_state(access_token, token_type, expires_at)
+    
+    def _save_cached_token(self, state: _TokenState) -> None:
+        """
+        Atomically write a token to the on-disk cache.
+        
+        Tokens without expiry info are not persisted. Write failures are
+        logged and otherwise ignored.
+        
+        Args:
+            state: Token state to persist
+        """
+        if state.expires_at is None:
+            return
+        
+        data = {
+            "access_token": state.access_token,
+            "token_type": state.token_type,
+            "expires_at": state.expires_at,
+            "mac": self._cache_mac(state.access_token, state.token_type, state.expires_at)
+        }
+        
+        try:
+            os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+            # mkstemp creates the file readable by the current user only
+            fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self._cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug("Failed to write token cache %s: %s", self._cache_path, e)
+    
+    def _remove_cached_token(self) -> None:
+        """Delete the on-disk cache file, if any."""
+        try:
+            os.remove(self._cache_path)
+        except OSError:
+            pass
+    
+    def _request_token(self, url: str, payload: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Request a token from a single endpoint.
+        
+        Tries a JSON body first and makes one form-encoded attempt if the
+        endpoint still returns an error after the adapter's retries.
+        
+        Args:
+            url: Token endpoint URL
+            payload: Client credentials payload
+            
+        Returns:
+            Parsed token response containing an access token, or None if
+            this endpoint did not return one
+        """
+        try:
+            # Try JSON format first; transient 5xx responses are already
+            # retried with backoff by the session's adapter
+            response = _SESSION.post(url, json=payload, headers=_JSON_HEADERS, timeout=10)
+            
+            if not response.ok:
+                logger.debug("Status %s from %s, trying form-encoded format...", response.status_code, url)
+                response = _SESSION.post(url, data=payload, headers=_FORM_HEADERS, timeout=10)
+            
+            if not response.ok:
+                logger.debug("Failed with status %s: %s", response.status_code, response.text)
+                return None
+            
+            token_data = _json_loads(response.content)
+            
+            if not isinstance(token_data, dict):
+                logger.debug("Unexpected response body from %s: %r", url, token_data)
+                return None
+            
+            if not token_data.get("access_token"):
+                logger.debug("No access token in response from %s", url)
+                return None
+            
+            return token_data
+            
+        except requests.exceptions.RequestException as e:
+            logger.debug("Request failed for %s: %s", url, e)
+        except ValueError as e:
+            logger.debug("Invalid JSON in response from %s: %s", url, e)
+        
+        return None
+    
+    def _probe_endpoints(self, payload: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Request a token from all candidate endpoints concurrently.
+        
+        The first endpoint to return a token is pinned in self._token_url so
+        later refreshes only call that one.
+        
+        Args:
+            payload: Client credentials payload
+            
+        Returns:
+            Parsed token response from the first successful endpoint, or
+            None if every endpoint failed
+        """
+        for url in _ENDPOINTS:
+            logger.debug("Trying endpoint %s", url)
         
-        if not self._token_expires_at:
-            # If we don't have expiration info, assume token is still valid
-            # This is a fallback for tokens that don't provide expiry info
-            return True
+        executor = ThreadPoolExecutor(max_workers=len(_ENDPOINTS))
+        try:
+            futures = {
+                executor.submit(self._request_token, url, payload): url
+                for url in _ENDPOINTS
+            }
+            for future in as_completed(futures):
+                token_data = future.result()
+                if token_data:
+                    self._token_url = futures[future]
+                    return token_data
+        finally:
+            # Don't wait for slower endpoints once we have a token
+            executor.shutdown(wait=False)
         
-        # Add a 5-minute buffer before expiration
-        buffer_time = timedelta(minutes=5)
-        return datetime.now() < (self._token_expires_at - buffer_time)
+        return None
     
-    def _create_access_token(self) -> str:
+    def _create_access_token(self) -> _TokenState:
         """
         Create a new access token using client credentials.
         
         Returns:
-            Access token string
+            Token state for the new access token
             
         Raises:
             Exception: If token creation fails
             ValueError: If not configured
         """
-        if not self.is_configured():
+        if not self._configured:
             raise ValueError("Token manager not configured. Call configure() first.")
         
-        print("Creating Airbyte access token...")
-        
-        # Try multiple endpoint variations
-        endpoints_to_try = [
-            "https://api.airbyte.com/api/public/v1/applications/token",
-            "https://api.airbyte.com/v1/applications/token",
-            "https://api.airbyte.ai/api/v1/applications/token"
-        ]
+        logger.info("Creating Airbyte access token...")
         
         payload = {
             "client_id": self._client_id,
@@ -127,75 +550,65 @@ class TokenManager:
             "scope": f"workspace:{self._workspace_id}"
         }
         
-        for i, url in enumerate(endpoints_to_try, 1):
-            print(f"🔄 Attempt {i}: Trying endpoint {url}")
+        token_data = None
+        if self._token_url:
+            logger.debug("Using endpoint %s", self._token_url)
+            token_data = self._request_token(self._token_url, payload)
+            if not token_data:
+                # Pinned endpoint stopped working; probe all of them again
+                self._token_url = None
+        
+        if not token_data:
+            token_data = self._probe_endpoints(payload)
+        
+        if not token_data:
+            raise Exception("Failed to create access token with all available endpoints")
+        
+        token_type = token_data.get("token_type", "Bearer")
+        expires_in = token_data.get("expires_in")
+        
+        if expires_in:
+            expires_at = time.time() + int(expires_in)
+            logger.debug("Access token created successfully")
+            logger.debug("Token type: %s", token_type)
+            logger.debug("Expires in: %s seconds", expires_in)
+        else:
+            expires_at = None
+            logger.debug("Access token created successfully (no expiration info)")
+        
+        return self._new_state(token_data["access_token"], token_type, expires_at)
+    
+    def _get_valid_state(self) -> _TokenState:
+        """
+        Get the current token state, creating or refreshing the token as needed.
+        
+        Returns:
+            Token state holding a valid access token
             
-            # Try JSON format first
-            headers = {
-                "accept": "application/json",
-                "content-type": "application/json"
-            }
+        Raises:
+            ValueError: If not configured
+            Exception: If token creation fails
+        """
+        # Fast path: one attribute load gives a consistent snapshot, so a
+        # valid token is returned without taking the lock
+        state = self._state
+        if state.access_token and time.monotonic() < state.deadline:
+            return state
+        
+        if not self._configured:
+            raise ValueError("Token manager not configured. Call configure() first.")
+        
+        with self._lock:
+            # Re-check: another thread may have refreshed while we waited
+            state = self._state
+            if not state.access_token or time.monotonic() >= state.deadline:
+                logger.debug("Token invalid or expired, creating new token...")
+                state = self._create_access_token()
+                self._state = state
+                if self._cache_path:
+                    self._save_cached_token(state)
             
-            try:
-                response = requests.post(url, json=payload, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    token_data = response.json()
-                    access_token = token_data.get("access_token")
-                    
-                    if not access_token:
-                        print(f"❌ No access token in response from {url}")
-                        continue
-                    
-                    # Store token metadata
-                    self._token_type = token_data.get("token_type", "Bearer")
-                    expires_in = token_data.get("expires_in")
-                    
-                    if expires_in:
-                        self._token_expires_at = datetime.now() + timedelta(seconds=int(expires_in))
-                        print(f"✅ Access token created successfully")
-                        print(f"Token type: {self._token_type}")
-                        print(f"Expires in: {expires_in} seconds")
-                    else:
-                        print(f"✅ Access token created successfully (no expiration info)")
-                        self._token_expires_at = None
-                    
-                    return access_token
-                    
-                elif response.status_code == 500:
-                    print(f"❌ 500 error with {url}, trying form-encoded format...")
-                    
-                    # Try form-encoded format
-                    form_headers = {
-                        "accept": "application/json",
-                        "content-type": "application/x-www-form-urlencoded"
-                    }
-                    
-                    alt_response = requests.post(url, data=payload, headers=form_headers, timeout=30)
-                    
-                    if alt_response.status_code == 200:
-                        token_data = alt_response.json()
-                        access_token = token_data.get("access_token")
-                        
-                        if access_token:
-                            self._token_type = token_data.get("token_type", "Bearer")
-                            expires_in = token_data.get("expires_in")
-                            
-                            if expires_in:
-                                self._token_expires_at = datetime.now() + timedelta(seconds=int(expires_in))
-                            
-                            print(f"✅ Access token created successfully with form-encoded format")
-                            return access_token
-                    else:
-                        print(f"❌ Form-encoded also failed: {alt_response.status_code}")
-                else:
-                    print(f"❌ Failed with status {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Request failed for {url}: {e}")
-                continue
-        
-        raise Exception("Failed to create access token with all available endpoints")
+            return state
     
     def get_token(self) -> str:
         """
@@ -208,15 +621,7 @@ class TokenManager:
             ValueError: If not configured
             Exception: If token creation fails
         """
-        if not self.is_configured():
-            raise ValueError("Token manager not configured. Call configure() first.")
-        
-        with self._lock:
-            if not self._is_token_valid():
-                print("Token invalid or expired, creating new token...")
-                self._access_token = self._create_access_token()
-            
-            return self._access_token
+        return self._get_valid_state().access_token
     
     def get_auth_header(self) -> Dict[str, str]:
         """
@@ -229,18 +634,21 @@ class TokenManager:
             ValueError: If not configured
             Exception: If token creation fails
         """
-        token = self.get_token()
-        return {"Authorization": f"{self._token_type} {token}"}
+        # Hand out a copy so callers can add their own headers without
+        # modifying the cached one
+        return self._get_valid_state().auth_header.copy()
     
     def invalidate_token(self) -> None:
         """
         Invalidate the current token, forcing a refresh on next use.
         This is useful when you know the token has been revoked or expired.
         """
-        with self._lock:
-            self._access_token = None
-            self._token_expires_at = None
-            print("Token invalidated")
+        # A single attribute store is atomic, so no lock is needed
+        self._state = _EMPTY_STATE
+        if self._cache_path:
+            # Don't let other processes pick up a token we know is bad
+            self._remove_cached_token()
+        logger.debug("Token invalidated")
     
     def get_token_info(self) -> Dict[str, Any]:
         """
@@ -249,21 +657,51 @@ class TokenManager:
         Returns:
             Dictionary containing token information
         """
+        # Read everything from one snapshot so the fields are consistent
+        # even if another thread refreshes or invalidates meanwhile
+        state = self._state
         return {
-            "has_token": bool(self._access_token),
-            "token_type": self._token_type,
-            "expires_at": self._token_expires_at.isoformat() if self._token_expires_at else None,
-            "is_valid": self._is_token_valid(),
-            "is_configured": self.is_configured()
+            "has_token": bool(state.access_token),
+            "token_type": state.token_type,
+            "expires_at": state.expires_at_iso,
+            "is_valid": bool(state.access_token) and time.monotonic() < state.deadline,
+            "is_configured": self._configured
         }
 
 
+# Created at import time so get_token_manager() is a plain global lookup
+_SINGLETON = TokenManager()
+
+
 # Convenience function to get the singleton instance
-def get_token_manager() -> TokenManager:
+def get_token_manager(
+    client_id: Optional[str] = None,
+    client_secret: Optional[str] = None,
+    workspace_id: Optional[str] = None
+) -> TokenManager:
     """
-    Get the singleton TokenManager instance.
+    Get a TokenManager instance.
     
+    Without arguments this returns the shared singleton, which must be set
+    up with configure(). With credentials it returns a configured instance
+    dedicated to that client and workspace, so several workspaces can hold
+    tokens at the same time without reconfiguring each other.
+    
+    Args:
+        client_id: Airbyte client ID
+        client_secret: Airbyte client secret
+        workspace_id: Airbyte workspace ID
+        
     Returns:
-        TokenManager singleton instance
+        TokenManager singleton, or the instance for the given credentials
+        
+    Raises:
+        ValueError: If only some of the credentials are provided
     """
-    return TokenManager()
+    if client_id is None and client_secret is None and workspace_id is None:
+        return _SINGLETON
+    
+    if not (client_id and client_secret and workspace_id):
+        raise ValueError("All parameters (client_id, client_secret, workspace_id) are required")
+    
+    return TokenManager._for_credentials(client_id, client_secret, workspace_id)